@@ -123,7 +123,8 @@ class BranchAndBound(BaseAlgorithm):
     def __init__(self: B, model: MILPInstance, Node: Type[BaseNode] = BaseNode,
                  node_queue: Any = None, node_limit: int = float('inf'),
                  mip_gap: float = .0001, logging: bool = False, max_run_time: float = float('inf'),
-                 initial_primal_bound: float = float('inf'), **kwargs: Any):
+                 initial_primal_bound: float = float('inf'), share_incumbent: bool = False,
+                 **kwargs: Any):
         f""" Instantiates a Branch and Bound instance.
         
         CAUTION: During instantiation, all problems are converted to minimization
@@ -143,6 +144,9 @@ class BranchAndBound(BaseAlgorithm):
         before terminating
         :param initial_primal_bound: Best known objective value for feasible solutions
         to the MIP. NOTE: the MIP will only return a solution if a better one is found.
+        :param share_incumbent: if True, pass the primal bound to each node's bound
+        method as max_dual_bound (or the given max_dual_bound if tighter) so cut
+        generation stops once the node can no longer beat the incumbent
         :param kwargs: dictionary passed to the branch and bound functions as
         key worded arguments and which adds keys and updates values based on
         what is returned
@@ -174,6 +178,9 @@ class BranchAndBound(BaseAlgorithm):
         # initial primal bound assert
         assert initial_primal_bound > -float('inf'), 'initial_primal_bound is real or infinite'
 
+        # share incumbent assert
+        assert isinstance(share_incumbent, bool), 'share_incumbent is boolean'
+
         # kwargs assert
         special_keys = {'right', 'left', 'cuts'}
         assert set(kwargs.keys()).isdisjoint(special_keys), \
@@ -195,6 +202,7 @@ class BranchAndBound(BaseAlgorithm):
         self.mip_gap = mip_gap
         self.logging = logging
         self.max_run_time = max_run_time
+        self.share_incumbent = share_incumbent
 
     @property
     def dual_bound(self):
@@ -243,7 +251,9 @@ class BranchAndBound(BaseAlgorithm):
     def _evaluate_node(self: B, node: BaseNode) -> None:
         """Bounds and optionally branches on the given node. Updates any attributes
         with the values keyed in the rtn's for bound and branch methods. Updates
-        the global lower bound
+        the global lower bound. If share_incumbent is set, the primal bound is passed
+        to bound as max_dual_bound so that cut generation ends once the node can no
+        longer beat the incumbent
 
         :param node: the object that is bounded and potentially branched on.
         :return:
@@ -251,7 +261,12 @@ class BranchAndBound(BaseAlgorithm):
         if node.dual_bound < self.primal_bound:
             self.evaluated_nodes += 1
 
-            self._process_bound_rtn(node.bound(**self._kwargs))
+            bound_kwargs = self._kwargs
+            if self.share_incumbent:
+                # stop cut generation once this node would be pruned anyway
+                bound_kwargs = {**self._kwargs, 'max_dual_bound': min(
+                    self.primal_bound, self._kwargs.get('max_dual_bound', float('inf')))}
+            self._process_bound_rtn(node.bound(**bound_kwargs))
 
             # this solver is not designed to handle unboundedness accurately
             # need feasible milp solution, but may never find one, so assumes we do
@@ -346,14 +361,18 @@ class BranchAndBound(BaseAlgorithm):
         # We take a max in each lineage because when minimizing b/c ancestors' LP relaxes
         # are LB on terminal node objective value. Since ancestor dual evals at b are
         # LB for for each ancestor node, they are also LB's for terminal node
+        # ancestors are shared by many lineages, so evaluate each node's dual only once
+        dual_evals = {}
         bounds = {}
         for node in terminal_nodes:
-            bounds[node.idx] = max(
-                np.inner(n.lp.dualConstraintSolution[n.lp.constraints[0].name], b) +
-                np.inner(np.maximum(np.concatenate([sol for sol in n.lp.dualVariableSolution.values()]), np.zeros(n.lp.nVariables)), n.lp.variablesLower) +
-                np.inner(np.minimum(np.concatenate([sol for sol in n.lp.dualVariableSolution.values()]), np.zeros(n.lp.nVariables)), n.lp.variablesUpper)
-                for n in self.tree.get_node_instances(node.lineage)
-            )
+            for n in self.tree.get_node_instances(node.lineage):
+                if n.idx not in dual_evals:
+                    dual_var = np.concatenate([sol for sol in n.lp.dualVariableSolution.values()])
+                    dual_evals[n.idx] = \
+                        np.inner(n.lp.dualConstraintSolution[n.lp.constraints[0].name], b) + \
+                        np.inner(np.maximum(dual_var, np.zeros(n.lp.nVariables)), n.lp.variablesLower) + \
+                        np.inner(np.minimum(dual_var, np.zeros(n.lp.nVariables)), n.lp.variablesUpper)
+            bounds[node.idx] = max(dual_evals[idx] for idx in node.lineage)
         return min(bounds.values())
 
     def _bound_parameterized_dual(self, cur_lp: CyClpSimplex) -> CyClpSimplex:
@@ -3,8 +3,13 @@ from __future__ import annotations
 from cylp.cy.CyClpSimplex import CyClpSimplex
 from cylp.py.modeling.CyLPModel import CyLPArray
 from math import floor, ceil, degrees, acos
+try:  # if you don't have numba installed, GMIC coefficients are found with numpy instead
+    from numba import njit
+except ImportError:
+    njit = None
 import numpy as np
 import re
+from scipy.sparse import csr_matrix
 from statistics import median
 import time
 from typing import Union, List, TypeVar, Dict, Any, Tuple, Set
@@ -13,13 +18,70 @@ from simple_mip_solver.utils.floating_point import numerically_safe_cut
 from simple_mip_solver.utils.tolerance import variable_epsilon,\
     good_coefficient_approximation_epsilon, max_nonzero_coefs, parallel_cut_tolerance, \
     cutting_plane_progress_tolerance, max_cut_generation_iterations, max_relative_cut_term_ratio, \
-    min_cut_depth
+    min_cut_depth, min_gmic_norm, duplicate_gmic_tolerance
 from test_simple_mip_solver.test_utils.test_utils import check_cut_against_grid, \
     check_cut, check_solution
 
 T = TypeVar('T', bound='BaseNode')
 
 
+def _gomory_coefficients_numpy(rows: np.ndarray, basic_mask: np.ndarray,
+                               integer_mask: np.ndarray, f0s: np.ndarray) -> \
+        Tuple[np.ndarray, np.ndarray]:
+    """ Find the coefficients of the GMICs generated by rows of the LP tableau
+    before their slack variables are substituted out. Assumes Ax >= b and x >= 0.
+
+    :param rows: 2D array of the tableau rows generating the cuts
+    :param basic_mask: True for each basic column of the tableau
+    :param integer_mask: True for each primary variable that is integer
+    :param f0s: fractional part of the value of each row's basic variable
+    :return: tuple of 2D arrays of the primary and slack variable coefficients
+    in the GMICs, with one row per cut
+    """
+    n = integer_mask.size
+    f0 = f0s[:, np.newaxis]
+    # values for continuous variables
+    # 0 for basic variables avoids getting small numbers that should be zero
+    a = np.where(basic_mask[:n], 0, rows[:, :n])
+    f = a - np.floor(a)
+    # primary variable coefficients in GMI cut, blended arithmetically instead of
+    # branching on each element. f/f0 <= (1 - f)/(1 - f0) exactly when f <= f0
+    is_integer = integer_mask.astype(np.float64)
+    pi = is_integer * np.minimum(f/f0, (1 - f)/(1 - f0)) + \
+        (1 - is_integer) * (np.maximum(a, 0)/f0 + np.maximum(-a, 0)/(1 - f0))
+    # slack variable coefficients in GMI cut, split into positive and negative parts
+    slacks = rows[:, n:]
+    pi_slacks = np.maximum(slacks, 0)/f0 + np.maximum(-slacks, 0)/(1 - f0)
+    return pi, pi_slacks
+
+
+def _gomory_coefficients_loop(rows: np.ndarray, basic_mask: np.ndarray,
+                              integer_mask: np.ndarray, f0s: np.ndarray) -> \
+        Tuple[np.ndarray, np.ndarray]:
+    """ Single pass version of _gomory_coefficients_numpy for numba to compile.
+    Takes the same arguments and returns the same coefficients.
+    """
+    n = integer_mask.size
+    k, width = rows.shape
+    pi = np.empty((k, n))
+    pi_slacks = np.empty((k, width - n))
+    for r in range(k):
+        f0 = f0s[r]
+        for i in range(n):
+            a = 0.0 if basic_mask[i] else rows[r, i]
+            f = a - np.floor(a)
+            is_integer = 1.0 * integer_mask[i]
+            pi[r, i] = is_integer * min(f/f0, (1 - f)/(1 - f0)) + \
+                (1 - is_integer) * (max(a, 0.0)/f0 + max(-a, 0.0)/(1 - f0))
+        for i in range(n, width):
+            pi_slacks[r, i - n] = max(rows[r, i], 0.0)/f0 + max(-rows[r, i], 0.0)/(1 - f0)
+    return pi, pi_slacks
+
+
+_gomory_coefficients = _gomory_coefficients_numpy if njit is None else \
+    njit(cache=True)(_gomory_coefficients_loop)
+
+
 class BaseNode:
     """ A node off of which all other types of nodes can be built for running
     against objects defined in algorithms. This default implementation includes
@@ -73,6 +135,9 @@ class BaseNode:
         lp.logLevel = 0
         self.lp = lp
         self._integer_indices = integer_indices
+        self._integer_indices_array = np.array(integer_indices, dtype=int)
+        self._integer_mask = np.zeros(lp.nVariables, dtype=bool)
+        self._integer_mask[integer_indices] = True
         self.idx = idx
         self.dual_bound = dual_bound
         self.objective_value = None
@@ -278,7 +343,8 @@ class BaseNode:
         sol = self.lp.primalVariableSolution
         self.solution = None if not self.lp_feasible else sol['x'] if \
             type(sol) == dict else sol
-        int_var_vals = None if not self.lp_feasible else self.solution[self._integer_indices]
+        int_var_vals = None if not self.lp_feasible else \
+            self.solution[self._integer_indices_array]
         self.mip_feasible = self.lp_feasible and \
             np.max(np.abs(np.round(int_var_vals) - int_var_vals)) <= variable_epsilon
         if track_dual_bound:
@@ -362,28 +428,69 @@ class BaseNode:
         setattr(self, f'number_gmic_{operation}',
                 getattr(self, f'number_gmic_{operation}') + matches)
 
-    def _generate_cuts(self: T, gomory_cuts: bool = True, **kwargs) -> \
-            Dict[str: Union[CyLPArray, float]]:
+    def _generate_cuts(self: T, gomory_cuts: bool = True, min_gmic_norm: float = min_gmic_norm,
+                       duplicate_gmic_tolerance: float = duplicate_gmic_tolerance,
+                       **kwargs) -> Dict[str: Union[CyLPArray, float]]:
         """ Generates one round of cuts
 
         :param gomory_cuts: if True, add gomory cuts to LP relaxation
+        :param min_gmic_norm: smallest acceptable norm for gomory cut
+        :param duplicate_gmic_tolerance: cosine similarity above which a gomory cut
+        is dropped as a duplicate of a deeper one. Dropped cuts still count as created
         :param kwargs: dictionary of arguments to pass on to selected subroutines
         :return: dictionary of cuts that can be added to the LP relaxation
         """
         assert isinstance(gomory_cuts, bool), 'gomory_cuts is boolean'
+        assert isinstance(min_gmic_norm, (float, int)) and min_gmic_norm > 0, \
+            'min_gmic_norm is a positive number'
+        assert isinstance(duplicate_gmic_tolerance, (float, int)) and \
+            0 < duplicate_gmic_tolerance <= 1, 'duplicate_gmic_tolerance must be number in (0, 1]'
 
         cut_pool = {}
         if gomory_cuts:
-            for row_idx, (pi, pi0) in self._find_gomory_cuts().items():
-                idx = f'cut_gomory_{self.idx}_{self.cut_generation_iterations}_{row_idx}'
-                # if idx == 'cut_gomory_5_2_2':
-                #     print()
+            cuts = self._find_gomory_cuts()
+            names = {row_idx: f'cut_gomory_{self.idx}_{self.cut_generation_iterations}_{row_idx}'
+                     for row_idx in cuts}
+            # every GMIC found counts as created, including those skipped below
+            self._update_gmic_counts(cut_idxs=list(names.values()), operation='created')
+
+            # skip degenerate and duplicate cuts before paying for their rational approximation
+            cuts = {row_idx: (pi, pi0) for row_idx, (pi, pi0) in cuts.items()
+                    if np.linalg.norm(pi) > min_gmic_norm}
+            cuts = self._remove_duplicate_cuts(cuts, duplicate_gmic_tolerance)
+            for row_idx, (pi, pi0) in cuts.items():
                 safe_pi, safe_pi0 = numerically_safe_cut(pi=pi, pi0=pi0, estimate='over')
-                cut_pool[idx] = safe_pi, safe_pi0
-
-            self._update_gmic_counts(cut_idxs=cut_pool, operation='created')
+                cut_pool[names[row_idx]] = safe_pi, safe_pi0
         return cut_pool
 
+    def _remove_duplicate_cuts(self: T, cuts: Dict[Any, Tuple[CyLPArray, float]],
+                               duplicate_gmic_tolerance: float) -> \
+            Dict[Any, Tuple[CyLPArray, float]]:
+        """ Remove each cut that points in the same direction as a deeper cut.
+        Of two parallel cuts, the one with the larger normalized right hand side
+        dominates the other, so nothing is lost. With a tolerance below the default,
+        this becomes a heuristic: a dropped cut that is only nearly parallel can still
+        cut off points the kept one does not, and _select_cuts may reject the kept one.
+
+        :param cuts: dictionary of cuts (pi, pi0) representing pi^T x >= pi0
+        :param duplicate_gmic_tolerance: cosine similarity above which two cuts
+        are considered duplicates
+        :return: dictionary of the remaining cuts in their original order
+        """
+        norms = {idx: np.linalg.norm(pi) for idx, (pi, pi0) in cuts.items()}
+        depths = {idx: (np.dot(pi, self.solution) - pi0) / norms[idx]
+                  for idx, (pi, pi0) in cuts.items()}
+        # rows hold the unit directions of the cuts kept so far
+        kept_directions = np.empty((len(cuts), self.lp.nVariables))
+        kept = set()
+        for idx in sorted(cuts, key=depths.get):
+            direction = cuts[idx][0] / norms[idx]
+            if not kept or np.max(kept_directions[:len(kept)] @ direction) <= \
+                    duplicate_gmic_tolerance:
+                kept_directions[len(kept)] = direction
+                kept.add(idx)
+        return {idx: cut for idx, cut in cuts.items() if idx in kept}
+
     def _select_cuts(self, max_nonzero_coefs: int = max_nonzero_coefs,
                      min_cut_depth: float = min_cut_depth,
                      parallel_cut_tolerance: float = parallel_cut_tolerance,
@@ -474,54 +581,78 @@ class BaseNode:
         Each tuple is indexed by the row in the LP tableau that generated the cut
         """
         cuts = {}
-        tableau = self.tableau  # create own tableau b/c CyLP's is incorrect
+        n = self.lp.nVariables
+        # the basis is fixed while finding cuts, so only ask CyLP for it once
+        B = np.asarray(self.basic_variable_indices)
+        # check all basic integer variables for fractionality at once
+        rows = np.where(B < n)[0]
+        rows = rows[self._integer_mask[B[rows]]]
+        values = self.solution[B[rows]]
+        f0s = values - np.floor(values)
+        fractional = np.minimum(f0s, np.ceil(values) - values) > variable_epsilon
+        # if whole number or close, skip to avoid numerical issues from division
+        fractional &= (f0s >= good_coefficient_approximation_epsilon) & \
+            (f0s + good_coefficient_approximation_epsilon <= 1)
+        fractions = dict(zip(rows[fractional].tolist(), f0s[fractional].tolist()))
+        if not fractions:
+            return cuts
+        # build only the rows generating cuts in one call, since CyLP's tableau is incorrect
+        tableau = self._tableau_rows(list(fractions), B)
         if tableau is None:
             return cuts
-        for row_idx, basic_idx in enumerate(self.basic_variable_indices):
-            if basic_idx in self._integer_indices and \
-                    self._is_fractional(self.solution[basic_idx]):
-                f0 = self._get_fraction(self.solution[basic_idx])
-                # if whole number or close, skip to avoid numerical issues from division
-                if f0 < good_coefficient_approximation_epsilon or \
-                        f0 + good_coefficient_approximation_epsilon > 1:
-                    continue
-                # 0 for basic variables avoids getting small numbers that should be zero
-                f = {i: 0 if i in self.basic_variable_indices else
-                     self._get_fraction(tableau[row_idx, i]) for i in
-                     range(self.lp.nVariables)}
-                # values for continuous variables
-                a = {i: 0 if i in self.basic_variable_indices else tableau[row_idx, i]
-                     for i in range(self.lp.nVariables)}
-                # primary variable coefficients in GMI cut
-                pi = CyLPArray(
-                    [f[j]/f0 if f[j] <= f0 and j in self._integer_indices else
-                     (1 - f[j])/(1 - f0) if j in self._integer_indices else
-                     a[j]/f0 if a[j] > 0 else -a[j]/(1 - f0) for j in range(self.lp.nVariables)]
-                )
-                # slack variable coefficients in GMI cut
-                pi_slacks = np.array([x/f0 if x > 0 else -x/(1 - f0) for x in
-                                      tableau[row_idx, self.lp.nVariables:]])
-                # sub out slack variables for primary variables. Ax >= b =>
-                # Ax - s = b => s = Ax - b. gomory is pi^T * x + pi_s^T * s >= 1, thus
-                # pi^T * x + pi_s^T * (Ax - b) >= 1 => (pi + A^T * pi_s)^T * x >= 1 + pi_s^T * b
-                coefs = pi + self.lp.coefMatrix.T * pi_slacks
-                rhs = 1 + np.dot(pi_slacks, self.lp.constraintsLower)
-                # append coefs^T * x >= rhs
-                cuts[row_idx] = (coefs, rhs)
+        basic_mask = np.zeros(tableau.shape[1], dtype=bool)
+        basic_mask[B] = True
+        # find every cut's coefficients in one compiled call rather than row by row
+        pi, pi_slacks = _gomory_coefficients(tableau, basic_mask, self._integer_mask,
+                                             np.array(list(fractions.values())))
+        # sub out slack variables for primary variables. Ax >= b =>
+        # Ax - s = b => s = Ax - b. gomory is pi^T * x + pi_s^T * s >= 1, thus
+        # pi^T * x + pi_s^T * (Ax - b) >= 1 => (pi + A^T * pi_s)^T * x >= 1 + pi_s^T * b
+        # accumulate in place so all cuts share the kernel's buffer without copies
+        coefs = pi
+        # A's CSC arrays are A^T in CSR, so multiply with plain scipy instead of
+        # transposing through CyLP's operator overloads. tocsc is free when A is CSC
+        A = self.lp.coefMatrix.tocsc()
+        A_T = csr_matrix((A.data, A.indices, A.indptr), shape=(A.shape[1], A.shape[0]))
+        coefs += (A_T @ pi_slacks.T).T
+        b = self.lp.constraintsLower
+        # append coefs^T * x >= rhs, each cut a view of its row in coefs
+        for row_idx, row_coefs, row_pi_slacks in zip(fractions, coefs, pi_slacks):
+            cuts[row_idx] = (CyLPArray(row_coefs), 1 + np.dot(row_pi_slacks, b))
         return cuts
 
     @property
     def tableau(self):
         """CyLP builds the tableau incorrectly, so building from scratch. Assumes Ax >= b"""
-        B = self.basic_variable_indices
+        return self._tableau_rows()
+
+    def _tableau_rows(self: T, rows: List[int] = None,
+                      basic_variable_indices: np.ndarray = None) -> Union[np.ndarray, None]:
+        """ Build the given rows of the tableau A_B^-1 [A, -I]. Assumes Ax >= b
+
+        :param rows: indices of the tableau rows to build. All rows if None
+        :param basic_variable_indices: the current basis if already known.
+        Fetched from the LP if None
+        :return: array of the requested rows or None if the basis is unusable
+        """
+        B = self.basic_variable_indices if basic_variable_indices is None else \
+            basic_variable_indices
         # There should be nConstrs basic variables but sometimes CyLP confuses itself
         if len(B) != self.lp.nConstraints:
             return None
-        A = np.concatenate((self.lp.coefMatrix.toarray(), -np.identity(self.lp.nConstraints)), axis=1)
-        A_B = A[:, B]
+        # build basis columns of [A, -I] directly so I is never formed
+        A = self.lp.coefMatrix.toarray()
+        n = self.lp.nVariables
+        A_B = np.zeros((self.lp.nConstraints, self.lp.nConstraints))
+        structural = B < n
+        A_B[:, structural] = A[:, B[structural]]
+        A_B[B[~structural] - n, np.where(~structural)[0]] = -1
         try:
             A_B_inv = np.linalg.inv(A_B)
-            return A_B_inv @ A
+            if rows is not None:
+                A_B_inv = A_B_inv[rows]
+            # A_B^-1 [A, -I] = [A_B^-1 A, -A_B^-1]
+            return np.concatenate((A_B_inv @ A, -A_B_inv), axis=1)
         except np.linalg.LinAlgError:  # catch singular matrices
             return None
     
@@ -550,16 +681,11 @@ class BaseNode:
         :return furthest_index: index corresponding to variable with most fractional
         value
         """
-        furthest_index = None
-        furthest_dist = variable_epsilon
-        if self.lp_feasible:
-            for idx in self._integer_indices:
-                dist = min(self.solution[idx] - floor(self.solution[idx]),
-                           ceil(self.solution[idx]) - self.solution[idx])
-                if dist > furthest_dist:
-                    furthest_dist = dist
-                    furthest_index = idx
-        return furthest_index
+        if not self.lp_feasible or not self._integer_indices:
+            return None
+        gaps = self._integrality_gaps()
+        furthest = int(np.argmax(gaps))
+        return self._integer_indices[furthest] if gaps[furthest] > variable_epsilon else None
 
     def _base_branch(self: T, branch_idx: int, next_node_idx: int = None,
                      **kwargs: Any) -> Dict[str, T]:
@@ -655,6 +781,15 @@ class BaseNode:
         assert isinstance(value, (int, float)), 'value should be a number'
         return min(value - floor(value), ceil(value) - value) > variable_epsilon
 
+    def _integrality_gaps(self: T) -> np.ndarray:
+        """Returns how far each integer variable's value in the LP relaxation
+        solution is from the nearest integer, ordered as self._integer_indices
+
+        :return: array of distances to the nearest integer
+        """
+        values = np.asarray(self.solution)[self._integer_indices_array]
+        return np.minimum(values - np.floor(values), np.ceil(values) - values)
+
     @staticmethod
     def _get_fraction(value: Union[int, float]) -> Union[int, float]:
         """Returns fractional part of value
@@ -54,9 +54,8 @@ class PseudoCostBranchNode(BaseNode):
         :return:
         """
         # strong branch all fractional indices that have not been assigned pseudocost
-        sb_indices = [idx for idx in self._integer_indices if
-                      self._is_fractional(self.solution[idx])
-                      and idx not in self.pseudo_costs]
+        sb_indices = [idx for idx, gap in zip(self._integer_indices, self._integrality_gaps())
+                      if gap > variable_epsilon and idx not in self.pseudo_costs]
         for idx in sb_indices:
             for strong_branch_node in self._strong_branch(idx, self.strong_branch_iters).values():
                 self._calculate_costs(strong_branch_node)
@@ -128,7 +127,8 @@ class PseudoCostBranchNode(BaseNode):
                    (ceil(self.solution[i]) - self.solution[i]),
                    pseudo_costs[i]['left']['cost'] *
                    (self.solution[i] - floor(self.solution[i])))
-            for i in self._integer_indices if self._is_fractional(self.solution[i])
+            for i, gap in zip(self._integer_indices, self._integrality_gaps())
+            if gap > variable_epsilon
         }
         return sorted(scores, key=scores.get, reverse=True)[0]
 
@@ -36,6 +36,13 @@ min_cut_depth = 1e-8
 # smallest acceptable norm for disjunctive cut
 min_cglp_norm = 1e-4
 
+# smallest acceptable norm for gomory mixed integer cut
+min_gmic_norm = 1e-4
+
+# cosine similarity above which two gomory mixed integer cuts are considered duplicates
+# only parallel cuts (up to round off) are safe to drop, so keep this close to 1
+duplicate_gmic_tolerance = 1 - 1e-10
+
 # max term (i.e. numerator or denominator) to use in creating fractional estimate
 # control how precise cut estimates are and thus how long we can continue finding "good" cuts
 # make this big while forcing integer coefs will make you sad :,(
@@ -229,6 +229,7 @@ class TestBranchAndBound(unittest.TestCase):
         self.assertTrue(bb.mip_gap, 'mip gap should be an attribute')
         self.assertFalse(bb.logging)
         self.assertTrue(bb.max_run_time == float('inf'))
+        self.assertFalse(bb.share_incumbent)
 
     def test_init_fails_asserts(self):
         bb = BranchAndBound(self.small_branch_std)
@@ -260,6 +261,10 @@ class TestBranchAndBound(unittest.TestCase):
         self.assertRaisesRegex(AssertionError, f'initial_primal_bound', BranchAndBound,
                                model=self.small_branch_std, initial_primal_bound=-float('inf'))
 
+        # share incumbent assert
+        self.assertRaisesRegex(AssertionError, f'share_incumbent', BranchAndBound,
+                               model=self.small_branch_std, share_incumbent=1)
+
         # kwargs asserts
         self.assertRaisesRegex(AssertionError, 'saved for later use', BranchAndBound,
                                model=self.small_branch_std, right=-5)
@@ -408,6 +413,16 @@ class TestBranchAndBound(unittest.TestCase):
             self.assertTrue(pbr.call_count == 0)
             self.assertTrue(bd.call_count == 1)
             self.assertTrue(bh.call_count == 0)
+            self.assertFalse('max_dual_bound' in bd.call_args.kwargs,
+                             'incumbent should only cap cut generation when shared')
+
+        # sharing the incumbent caps cut generation at the primal bound
+        bb.share_incumbent = True
+        with patch.object(bb.root_node, 'bound') as bd:
+            bd.return_value = {}
+            bb._evaluate_node(bb.root_node)
+            self.assertTrue(bd.call_args.kwargs['max_dual_bound'] == -2,
+                            'incumbent should cap cut generation')
 
     def test_evaluate_node_unbounded(self):
         bb = BranchAndBound(unbounded)
@@ -15,6 +15,9 @@ import unittest
 from unittest.mock import patch, PropertyMock
 
 from simple_mip_solver import BaseNode
+from simple_mip_solver.nodes.base_node import _gomory_coefficients, \
+    _gomory_coefficients_numpy, _gomory_coefficients_loop
+from simple_mip_solver.utils.tolerance import duplicate_gmic_tolerance
 from simple_mip_solver.algorithms.base_algorithm import BaseAlgorithm
 from test_simple_mip_solver.example_models import no_branch, small_branch, \
     infeasible, random, unbounded, cut2, cut1, small_branch_copy, cut3, small_branch_max
@@ -38,6 +41,10 @@ class TestBaseNode(TestModels):
         node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices)
         self.assertTrue(node.lp, 'should get a model on proper instantiation')
         self.assertTrue(node._integer_indices == [0, 1, 2], 'should have list of integer indices')
+        self.assertTrue(all(node._integer_indices_array == [0, 1, 2]),
+                        'should have array of integer indices')
+        self.assertTrue(all(node._integer_mask == [True, True, True]),
+                        'should flag each integer index')
         self.assertFalse(node.idx, 'idx should be None')
         self.assertTrue(node.dual_bound == -float('inf'))
         self.assertFalse(node.objective_value, 'should have obj but empty')
@@ -529,6 +536,10 @@ class TestBaseNode(TestModels):
         node._bound_lp()
         self.assertRaisesRegex(AssertionError, 'gomory_cuts is boolean',
                                node._generate_cuts, gomory_cuts='False')
+        self.assertRaisesRegex(AssertionError, 'min_gmic_norm is a positive number',
+                               node._generate_cuts, min_gmic_norm=0)
+        self.assertRaisesRegex(AssertionError, 'duplicate_gmic_tolerance must be number in \(0, 1\]',
+                               node._generate_cuts, duplicate_gmic_tolerance=0)
 
     def test_generate_cuts(self):
         node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices, idx=0)
@@ -549,10 +560,51 @@ class TestBaseNode(TestModels):
             self.assertTrue(cut_pool['cut_gomory_0_0_0'][1] == -2)
             self.assertTrue(ugc.called)
             self.assertTrue(ugc.call_args.kwargs['operation'] == 'created')
-            self.assertTrue(ugc.call_args.kwargs['cut_idxs'] == cut_pool)
+            self.assertTrue(ugc.call_args.kwargs['cut_idxs'] == list(cut_pool))
+
+        # cuts with too small of a norm are never approximated or added to the pool
+        # but still count as created
+        with patch.object(node, '_find_gomory_cuts') as fgc, \
+                patch('simple_mip_solver.nodes.base_node.numerically_safe_cut') as nsc:
+            fgc.return_value = {0: (CyLPArray([0, -1e-5, 0]), -2)}
+            number_gmic_created = node.number_gmic_created
+            self.assertFalse(node._generate_cuts(gomory_cuts=True))
+            self.assertFalse(nsc.called)
+            self.assertTrue(node.number_gmic_created == number_gmic_created + 1)
+
+        # duplicate cuts are only approximated once but all count as created
+        with patch.object(node, '_find_gomory_cuts') as fgc, \
+                patch('simple_mip_solver.nodes.base_node.numerically_safe_cut') as nsc:
+            fgc.return_value = {0: (CyLPArray([0, -1, 0]), -2), 1: (CyLPArray([0, -2, 0]), -4)}
+            nsc.return_value = (CyLPArray([0, -1, 0]), -2)
+            number_gmic_created = node.number_gmic_created
+            self.assertTrue(len(node._generate_cuts(gomory_cuts=True)) == 1)
+            self.assertTrue(nsc.call_count == 1)
+            self.assertTrue(node.number_gmic_created == number_gmic_created + 2)
 
         self.assertFalse(node._generate_cuts(gomory_cuts=False))
 
+    def test_remove_duplicate_cuts(self):
+        node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices, idx=0)
+        node._bound_lp()
+        cuts = {
+            0: (CyLPArray([1, 0, 0]), 0),  # nearly parallel to deeper cut 1
+            1: (CyLPArray([2, 0, .001]), 100),  # keep
+            2: (CyLPArray([0, 1, 0]), 0),  # parallel to deeper cut 4
+            3: (CyLPArray([-1, 0, 0]), 0),  # opposite direction of cut 0 so keep
+            4: (CyLPArray([0, 3, 0]), 3)  # keep
+        }
+        kept = node._remove_duplicate_cuts(cuts, duplicate_gmic_tolerance)
+        self.assertTrue(list(kept) == [0, 1, 3, 4])
+        self.assertTrue(all(kept[4][0] == cuts[4][0]) and kept[4][1] == cuts[4][1])
+
+        # a looser tolerance also drops nearly parallel cuts
+        self.assertTrue(list(node._remove_duplicate_cuts(cuts, .999)) == [1, 3, 4])
+
+        # a strict enough tolerance keeps every cut
+        self.assertTrue(list(node._remove_duplicate_cuts(cuts, 1)) == [0, 1, 2, 3, 4])
+        self.assertFalse(node._remove_duplicate_cuts({}, duplicate_gmic_tolerance))
+
     def test_select_cuts_fails_asserts(self):
         node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices)
         node._bound_lp()
@@ -665,6 +717,21 @@ class TestBaseNode(TestModels):
             cuts = node._find_gomory_cuts()
             self.assertFalse(cuts)
 
+    def test_gomory_coefficients(self):
+        rows = np.array([[1, .25, -1.5, 2.75, 0, -.5, .4],
+                         [0, .5, .25, -1, 1, .2, 0]])
+        basic_mask = np.array([True, False, False, False, True, False, False])
+        integer_mask = np.array([True, True, True, False])
+        f0s = np.array([.4, .5])
+        pi, pi_slacks = _gomory_coefficients_numpy(rows, basic_mask, integer_mask, f0s)
+        self.assertTrue(np.allclose(pi, [[0, .625, 5/6, 6.875], [0, 1, .5, 2]]))
+        self.assertTrue(np.allclose(pi_slacks, [[0, 5/6, 1], [2, .4, 0]]))
+        # every implementation should give exactly the same coefficients
+        for func in [_gomory_coefficients_loop, _gomory_coefficients]:
+            other_pi, other_pi_slacks = func(rows, basic_mask, integer_mask, f0s)
+            self.assertTrue(np.array_equal(other_pi, pi))
+            self.assertTrue(np.array_equal(other_pi_slacks, pi_slacks))
+
     def test_tableau(self):
         node = BaseNode(lp=self.cut3_std.lp, integer_indices=self.cut3_std.integerIndices)
         node._bound_lp()
@@ -678,6 +745,20 @@ class TestBaseNode(TestModels):
             bvi.return_value = [0, 1]
             self.assertFalse(node.tableau)
 
+    def test_tableau_rows(self):
+        node = BaseNode(lp=self.cut3_std.lp, integer_indices=self.cut3_std.integerIndices)
+        node._bound_lp()
+        rows = node._tableau_rows([2, 0])
+        self.assertTrue(rows.shape == (2, 5))
+        self.assertTrue(np.max(abs(node.tableau[[2, 0]] - rows)) < 1e-12)
+
+        # a basis passed in is used instead of asking the lp for it again
+        B = node.basic_variable_indices
+        mock_pth = 'simple_mip_solver.nodes.base_node.BaseNode.basic_variable_indices'
+        with patch(mock_pth, new_callable=PropertyMock) as bvi:
+            self.assertTrue(np.array_equal(node._tableau_rows([2, 0], B), rows))
+            self.assertFalse(bvi.called)
+
     def test_basic_variable_indices(self):
         node = BaseNode(lp=self.cut3_std.lp, integer_indices=self.cut3_std.integerIndices)
         node._bound_lp()
@@ -825,6 +906,11 @@ class TestBaseNode(TestModels):
         node.bound(gomory_cuts=False)
         self.assertTrue(node._most_fractional_index == 2)
 
+    def test_integrality_gaps(self):
+        node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices, 0)
+        node.solution = np.array([0, 1.25, 2.5, 3.9])
+        self.assertTrue(np.allclose(node._integrality_gaps(), [0, .25, .5]))
+
     def test_branch(self):
         node = BaseNode(self.small_branch_std.lp, self.small_branch_std.integerIndices, 0)
         node.bound()